@@ -1,33 +1,77 @@
 import os
+import sys
+import re
 import logging
 import shutil
+import stat
 import threading
 import queue
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from tkinter.font import Font
 import random
 import string
 import hashlib
+import multiprocessing
+import io
 import time
 from datetime import datetime
+from collections import Counter, deque
 import json
-from typing import List, Tuple, Optional, Dict, Callable
-import webbrowser
+import sqlite3
+from typing import List, Tuple, Optional, Dict, Callable, Iterator, Iterable, FrozenSet, Union
+
+try:
+    import blake3
+    _B3 = blake3.blake3
+except ImportError:
+    _B3 = None
+
+try:
+    import orjson
+    _json_dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = lambda obj: json.dumps(obj, indent=2).encode()
+    _json_loads = json.loads
 
 # Constants
 CONFIG_FILE = "cons0leweb_utils_config.json"
+LOG_FILE = "cons0leweb_utils.log"
+CHECKSUM_CACHE_FILE = "cons0leweb_utils_checksums.sqlite"
+CHECKSUM_CACHE_TIMEOUT = 0.5  # Seconds to wait for a checksum cache locked by another run
+LOG_POLL_MS = 1000  # Log viewer refresh interval
+PROGRESS_POLL_MS = 100  # Status bar refresh interval
+PREVIEW_DEBOUNCE_MS = 150  # Rename preview waits this long after the last keystroke
+CHECKSUM_BATCH_LINES = 256  # Checksum results are sent to the UI in batches of this many lines...
+CHECKSUM_BATCH_SECONDS = 0.25  # ...or at least this often
+CHECKSUM_MAX_ERRORS = 500  # Only the most recent checksum errors are kept for display
+RENAME_PLACEHOLDER_RE = re.compile(r"(\{[ndtr]\})")
 DEFAULT_EXTENSIONS = ['.txt', '.html', '.css', '.js', '.py', '.json']
 MAX_THREADS = 8
 MAX_FILE_SIZE_MB = 10  # Default max file size in MB
 BACKUP_EXTENSION = '.bak.cu'
+CHECKSUM_CHUNK = 8 << 20  # Read size for hashing; tune to the filesystem's preferred I/O size
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB buffer for streaming file copies
+DUPLICATE_PREFIX_SIZE = 64 * 1024  # Bytes hashed to prefilter duplicate candidates
+PROCESS_HASH_MIN_SIZE = 16 << 20  # Files above this are hashed in a separate process
+DROP_CACHE_MIN_SIZE = 64 << 20  # Files above this are dropped from the page cache once hashed
+CHECKSUM_ALGORITHMS = ["blake2b", "md5", "sha1", "sha256", "sha512"] + (["blake3"] if _B3 else [])
+
+# Translation tables mapping os.urandom() bytes onto printable alphabets
+_CONTENT_ALPHABET = (string.ascii_letters + string.digits + " \n").encode()
+_CONTENT_LUT = bytes(_CONTENT_ALPHABET[i % len(_CONTENT_ALPHABET)] for i in range(256))
+_NAME_ALPHABET = string.ascii_letters.encode()
+_NAME_LUT = bytes(_NAME_ALPHABET[i % len(_NAME_ALPHABET)] for i in range(256))
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('cons0leweb_utils.log'),
+        logging.FileHandler(LOG_FILE, encoding='utf-8'),
         logging.StreamHandler()
     ]
 )
@@ -35,90 +79,201 @@ logging.basicConfig(
 class FileProcessor:
     """Core file processing functionality with thread safety and error handling"""
     
-    def __init__(self):
-        self.file_queue = queue.Queue()
-        self.workers = []
-        self.running = False
-        self.lock = threading.Lock()
-        self.progress = {"total": 0, "processed": 0, "errors": 0}
-        
-    def start_workers(self, num_threads: int = MAX_THREADS):
-        """Start worker threads for parallel processing"""
-        self.running = True
-        for _ in range(num_threads):
-            worker = threading.Thread(target=self._worker)
-            worker.daemon = True
-            worker.start()
-            self.workers.append(worker)
-    
-    def stop_workers(self):
-        """Stop all worker threads"""
-        self.running = False
-        for _ in range(len(self.workers)):
-            self.file_queue.put(None)
-        for worker in self.workers:
-            worker.join()
-        self.workers = []
-    
-    def _worker(self):
-        """Worker thread that processes files from the queue"""
-        while self.running:
-            task = self.file_queue.get()
-            if task is None:
-                break
-                
+    def __init__(self, num_threads: int = MAX_THREADS, ui_queue: Optional[queue.SimpleQueue] = None):
+        self.pool = ThreadPoolExecutor(max_workers=num_threads)
+        self.procpool: Optional[ProcessPoolExecutor] = None
+        # Progress events as (counter, increment); only the UI thread consumes them
+        self.ui_queue = ui_queue if ui_queue is not None else queue.SimpleQueue()
+    
+    def shutdown(self):
+        """Stop the worker pools, dropping tasks that have not started yet"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.procpool is not None:
+            # Waiting avoids a teardown race in the pool's wakeup pipe at exit
+            self.procpool.shutdown(wait=True, cancel_futures=True)
+    
+    def digest_files(self, files: List[Tuple[str, int]], algorithm: str = "default") -> Dict[str, Optional[bytes]]:
+        """Digest (path, size) pairs in parallel, using processes for large files"""
+        futures = {}
+        for file_path, size in files:
+            future = pool = None
+            if size > PROCESS_HASH_MIN_SIZE:
+                if self.procpool is None:
+                    # Forking a process that runs Tk and worker threads can deadlock the child
+                    self.procpool = ProcessPoolExecutor(
+                        max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+                    )
+                pool = self.procpool
+                try:
+                    future = pool.submit(FileOperations.calculate_digest, file_path, algorithm)
+                except BrokenProcessPool as e:
+                    self._drop_procpool(pool, e)
+            if future is None:
+                future = self.pool.submit(FileOperations.calculate_digest, file_path, algorithm)
+            futures[future] = (file_path, pool)
+        
+        results = {}
+        retry = []
+        for future in as_completed(futures):
+            file_path, pool = futures[future]
             try:
-                func, args, kwargs = task
-                func(*args, **kwargs)
-                with self.lock:
-                    self.progress["processed"] += 1
+                results[file_path] = future.result()
+            except BrokenProcessPool as e:
+                # A worker process died; hash its files on threads instead
+                self._drop_procpool(pool, e)
+                retry.append(file_path)
             except Exception as e:
-                logging.error(f"Error processing task: {e}")
-                with self.lock:
-                    self.progress["errors"] += 1
-            finally:
-                self.file_queue.task_done()
-    
-    def add_task(self, func: Callable, *args, **kwargs):
-        """Add a task to the processing queue"""
-        self.file_queue.put((func, args, kwargs))
-        with self.lock:
-            self.progress["total"] += 1
-    
-    def get_progress(self) -> Dict[str, int]:
-        """Get current processing progress"""
-        with self.lock:
-            return self.progress.copy()
+                logging.error(f"Error calculating checksum for {file_path}: {e}")
+                results[file_path] = None
+        
+        retry_futures = {self.pool.submit(FileOperations.calculate_digest, file_path, algorithm): file_path
+                         for file_path in retry}
+        for future in as_completed(retry_futures):
+            results[retry_futures[future]] = future.result()
+        return results
     
-    def reset_progress(self):
-        """Reset progress counters"""
-        with self.lock:
-            self.progress = {"total": 0, "processed": 0, "errors": 0}
+    def _drop_procpool(self, pool: Optional[ProcessPoolExecutor], error: Exception):
+        """Discard a broken process pool so the next large file starts a fresh one"""
+        if pool is None or pool is not self.procpool:
+            return
+        logging.error(f"Hashing process pool failed, it will be restarted: {error}")
+        self.procpool = None
+        pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _tally(self, future: Future):
+        """Record the outcome of a finished task"""
+        if future.cancelled():
+            return
+        
+        error = future.exception()
+        if error is None:
+            key = "processed"
+        else:
+            logging.error(f"Error processing task: {error}")
+            key = "errors"
+        self.ui_queue.put((key, 1))
+    
+    def add_task(self, func: Callable, *args, **kwargs) -> Future:
+        """Submit a task to the worker pool"""
+        self.ui_queue.put(("total", 1))
+        future = self.pool.submit(func, *args, **kwargs)
+        future.add_done_callback(self._tally)
+        return future
 
 class FileOperations:
     """Static class for file operations with enhanced functionality"""
     
+    @staticmethod
+    def random_letters(length: int) -> str:
+        """Generate a random string of ASCII letters"""
+        return os.urandom(length).translate(_NAME_LUT).decode('ascii')
+    
+    @staticmethod
+    def normalize_extensions(extensions: Iterable[str]) -> FrozenSet[str]:
+        """Normalize extensions to a lowercase, dot-prefixed set"""
+        cleaned = (ext.strip().lower() for ext in extensions)
+        return frozenset(ext if ext.startswith('.') else f".{ext}" for ext in cleaned if ext)
+    
+    @staticmethod
+    def iter_files(folder_path: str, recursive: bool = True,
+                   dir_mtimes: Optional[Dict[str, int]] = None) -> Iterator[os.DirEntry]:
+        """Yield directory entries for all files under a folder"""
+        stack = [folder_path]
+        while stack:
+            current = stack.pop()
+            try:
+                if dir_mtimes is not None:
+                    # Stat before listing so any later change shows up as a newer mtime
+                    dir_mtimes[current] = os.stat(current).st_mtime_ns
+                # List each directory up front so callers may rename while iterating
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError as e:
+                logging.error(f"Error scanning {current}: {e}")
+                continue
+            
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+                except OSError as e:
+                    logging.error(f"Error scanning {entry.path}: {e}")
+    
+    @staticmethod
+    def can_replace_file(file_path: str) -> bool:
+        """Check that writing a new file over this one keeps everything but its mode intact"""
+        try:
+            st = os.lstat(file_path)
+            # Symlinks and hard links would be split off from the rewritten file
+            if not stat.S_ISREG(st.st_mode) or st.st_nlink != 1:
+                return False
+            # A new file gets our owner and group and none of the old ACLs or xattrs
+            if hasattr(os, 'geteuid') and (st.st_uid != os.geteuid() or st.st_gid != os.getegid()):
+                return False
+            if hasattr(os, 'listxattr') and os.listxattr(file_path):
+                return False
+            return True
+        except OSError:
+            return False
+    
     @staticmethod
     def add_text_to_file(file_path: str, text: str, position: str = "start", 
                         create_backup: bool = True, encoding: str = "utf-8") -> bool:
         """Add text to file at specified position with backup option"""
         try:
-            if create_backup:
-                FileOperations.create_backup(file_path)
-            
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
+            newline = os.linesep.encode()
+            payload = text.encode(encoding)
             
-            with open(file_path, 'w', encoding=encoding) as f:
-                if position == "start":
-                    f.write(text + "\n" + content)
-                elif position == "end":
-                    f.write(content + "\n" + text)
-                elif position == "random":
-                    lines = content.splitlines()
-                    insert_pos = random.randint(0, len(lines))
-                    lines.insert(insert_pos, text)
-                    f.write("\n".join(lines))
+            if position in ("start", "end") and create_backup and FileOperations.can_replace_file(file_path):
+                # Move the original aside and stream it back with the text attached
+                backup_path = FileOperations.get_backup_path(file_path)
+                os.replace(file_path, backup_path)
+                logging.info(f"Backup created: {backup_path}")
+                try:
+                    with open(backup_path, 'rb') as src, open(file_path, 'wb') as dst:
+                        if position == "start":
+                            dst.write(payload + newline)
+                        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                        if position == "end":
+                            dst.write(newline + payload)
+                    shutil.copymode(backup_path, file_path)
+                except Exception:
+                    os.replace(backup_path, file_path)
+                    raise
+            elif position == "end":
+                if create_backup:
+                    FileOperations.create_backup(file_path)
+                with open(file_path, 'ab') as f:
+                    f.write(newline + payload)
+            else:
+                if create_backup:
+                    FileOperations.create_backup(file_path)
+                
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                
+                # Splice the text in as a new line after the chosen newline
+                newlines = data.count(b"\n")
+                # An unterminated last line adds one more slot, after the end of the file
+                slots = newlines + (1 if data and not data.endswith(b"\n") else 0)
+                line = random.randint(0, slots) if position == "random" else 0
+                
+                if line > newlines:
+                    with open(file_path, 'ab') as f:
+                        f.write(newline + payload)
+                else:
+                    idx = -1
+                    for _ in range(line):
+                        idx = data.index(b"\n", idx + 1)
+                    
+                    view = memoryview(data)
+                    with open(file_path, 'wb') as f:
+                        f.write(view[:idx + 1])
+                        f.write(payload + newline)
+                        f.write(view[idx + 1:])
             
             logging.info(f"Text added to {position} of {file_path}")
             return True
@@ -126,13 +281,59 @@ class FileOperations:
             logging.error(f"Error processing {file_path}: {e}")
             return False
     
+    @staticmethod
+    def get_backup_path(file_path: str) -> str:
+        """Build a timestamped backup path for the file"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"{file_path}_{timestamp}{BACKUP_EXTENSION}"
+    
+    @staticmethod
+    def fast_copy(src: str, dst: str):
+        """Copy file contents and metadata, using in-kernel copies on Linux"""
+        if not sys.platform.startswith('linux'):
+            # copy2 already uses fcopyfile on macOS and CopyFile2 on Windows
+            shutil.copy2(src, dst)
+            return
+        
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            infd, outfd = fsrc.fileno(), fdst.fileno()
+            size = os.fstat(infd).st_size
+            copied = 0
+            
+            kernel_copies = [lambda count: os.sendfile(outfd, infd, None, count)]
+            if hasattr(os, 'copy_file_range'):
+                kernel_copies.insert(0, lambda count: os.copy_file_range(infd, outfd, count))
+            
+            for kernel_copy in kernel_copies:
+                try:
+                    while copied < size:
+                        n = kernel_copy(size - copied)
+                        if not n:
+                            break
+                        copied += n
+                except OSError:
+                    # Unsupported for this pair of files; try the next method
+                    if copied:
+                        raise
+                    continue
+                # Some filesystems report 0 bytes at offset 0 instead of failing
+                if copied or not size:
+                    break
+            else:
+                shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+                copied = fdst.tell()
+            
+            if copied != size:
+                raise OSError(f"Short copy of {src}: {copied} of {size} bytes")
+        
+        shutil.copystat(src, dst)
+    
     @staticmethod
     def create_backup(file_path: str) -> Optional[str]:
         """Create a backup of the file with timestamp"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{file_path}_{timestamp}{BACKUP_EXTENSION}"
-            shutil.copy2(file_path, backup_path)
+            backup_path = FileOperations.get_backup_path(file_path)
+            FileOperations.fast_copy(file_path, backup_path)
             logging.info(f"Backup created: {backup_path}")
             return backup_path
         except Exception as e:
@@ -148,7 +349,7 @@ class FileOperations:
                 return False
                 
             original_path = backup_path[:-len(BACKUP_EXTENSION)]
-            shutil.copy2(backup_path, original_path)
+            FileOperations.fast_copy(backup_path, original_path)
             logging.info(f"Restored {original_path} from backup")
             return True
         except Exception as e:
@@ -163,20 +364,22 @@ class FileOperations:
             os.makedirs(folder_path, exist_ok=True)
             
             if name_type == "random":
-                filename = f"{''.join(random.choices(string.ascii_letters, k=8))}.{extension}"
+                filename = f"{FileOperations.random_letters(8)}.{extension}"
             else:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 filename = f"dummy_{timestamp}.{extension}"
             
             file_path = os.path.join(folder_path, filename)
             
-            with open(file_path, 'w') as f:
-                if content:
-                    f.write(content)
-                else:
-                    # Generate some random content
-                    f.write(f"This is a dummy {extension} file created on {datetime.now()}\n")
-                    f.write("".join(random.choices(string.ascii_letters + string.digits + " \n", k=100)))
+            if content:
+                data = content.encode()
+            else:
+                # Generate some random content
+                header = f"This is a dummy {extension} file created on {datetime.now()}\n"
+                data = header.encode() + os.urandom(100).translate(_CONTENT_LUT)
+            
+            with open(file_path, 'wb', buffering=0) as f:
+                f.write(data)
             
             logging.info(f"Created dummy file: {file_path}")
             return file_path
@@ -185,49 +388,263 @@ class FileOperations:
             return None
     
     @staticmethod
-    def calculate_checksum(file_path: str, algorithm: str = "md5") -> Optional[str]:
+    def prefetch(file_path: Union[str, bytes], length: int = CHECKSUM_CHUNK):
+        """Ask the kernel to start reading the head of a file in the background"""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            return  # Hashing the file will report the error
+        try:
+            os.posix_fadvise(fd, 0, length, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def calculate_checksum(file_path: Union[str, bytes], algorithm: str = "blake2b") -> Optional[str]:
         """Calculate file checksum using specified algorithm"""
+        digest = FileOperations.calculate_digest(file_path, algorithm)
+        return digest.hex() if digest is not None else None
+    
+    @staticmethod
+    def calculate_digest(file_path: Union[str, bytes], algorithm: str = "blake2b") -> Optional[bytes]:
+        """Calculate the raw file digest bytes using specified algorithm"""
         try:
-            hash_func = getattr(hashlib, algorithm)()
-            
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_func.update(chunk)
-            
-            return hash_func.hexdigest()
+            return FileOperations.hash_file(file_path, algorithm)
         except Exception as e:
             logging.error(f"Error calculating checksum for {file_path}: {e}")
             return None
     
     @staticmethod
-    def batch_rename(folder_path: str, pattern: str, 
-                    extensions: List[str], recursive: bool = False) -> int:
-        """Batch rename files with specified pattern"""
-        renamed = 0
+    def hash_file(file_path: Union[str, bytes], algorithm: str = "blake2b") -> bytes:
+        """Calculate the raw file digest bytes, raising if the file can't be hashed"""
+        # "default" picks the fastest available hash: BLAKE3 if installed, else BLAKE2b
+        if algorithm in ("blake3", "default") and _B3 is not None:
+            digest = _B3
+        elif algorithm == "blake3":
+            raise ValueError("blake3 package is not installed")
+        elif algorithm == "default":
+            digest = hashlib.blake2b
+        else:
+            digest = getattr(hashlib, algorithm)
         
-        for root, _, files in os.walk(folder_path):
-            for filename in files:
-                if any(filename.endswith(ext) for ext in extensions):
-                    try:
-                        name, ext = os.path.splitext(filename)
-                        new_name = pattern.replace("{n}", name)
-                        new_name = new_name.replace("{d}", datetime.now().strftime("%Y%m%d"))
-                        new_name = new_name.replace("{t}", datetime.now().strftime("%H%M%S"))
-                        new_name = new_name.replace("{r}", ''.join(random.choices(string.ascii_letters, k=4)))
-                        
-                        src = os.path.join(root, filename)
-                        dst = os.path.join(root, f"{new_name}{ext}")
-                        
-                        if src != dst:
-                            os.rename(src, dst)
-                            renamed += 1
-                    except Exception as e:
-                        logging.error(f"Error renaming {filename}: {e}")
+        with open(file_path, 'rb', buffering=0) as f:
+            if digest is _B3:
+                # BLAKE3 splits each large update across its own thread pool
+                hash_func = _B3(max_threads=_B3.AUTO)
+            else:
+                hash_func = digest()
+            fd = f.fileno()
+            size = os.fstat(fd).st_size
+            if size > CHECKSUM_CHUNK and hasattr(os, 'posix_fadvise'):
+                # Widen kernel readahead so the next chunk is in flight while we hash
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # Don't allocate the full chunk for files smaller than it
+            buf = bytearray(min(CHECKSUM_CHUNK, max(size, 64 * 1024)))
+            mv = memoryview(buf)
+            # This is the loop hashlib.file_digest runs, with a bigger buffer; updates
+            # this large release the GIL, so worker threads hash in parallel. Reading
+            # rather than mmapping means a file truncated mid-hash just ends early
+            # instead of killing the process with SIGBUS
+            while True:
+                n = f.readinto(mv)
+                if not n:
+                    break
+                hash_func.update(mv[:n])
+            if size > DROP_CACHE_MIN_SIZE and hasattr(os, 'posix_fadvise'):
+                # Don't let bulk runs evict everything else from the page cache
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        
+        return hash_func.digest()
+    
+    @staticmethod
+    def delete_empty_files(folder_path: str) -> int:
+        """Delete all empty files under a folder, returning how many were removed"""
+        empty = []
+        for entry in FileOperations.iter_files(folder_path):
+            try:
+                if entry.stat().st_size == 0:
+                    empty.append(entry.path)
+            except OSError as e:
+                logging.error(f"Error checking {entry.path}: {e}")
+        
+        deleted = 0
+        for file_path in empty:
+            try:
+                os.unlink(file_path)
+                deleted += 1
+            except OSError as e:
+                logging.error(f"Error deleting {file_path}: {e}")
+        
+        return deleted
+    
+    @staticmethod
+    def find_duplicates(folder_path: str, processor: Optional[FileProcessor] = None) -> List[Tuple[str, str]]:
+        """Find duplicate files, returning (duplicate, original) pairs"""
+        # Stage 1: only files sharing a size can be duplicates
+        by_size: Dict[int, List[str]] = {}
+        for entry in FileOperations.iter_files(folder_path):
+            try:
+                by_size.setdefault(entry.stat().st_size, []).append(entry.path)
+            except OSError as e:
+                logging.error(f"Error processing {entry.path}: {e}")
+        
+        duplicates = []
+        full_hash_groups = []
+        for size, paths in by_size.items():
+            if len(paths) < 2:
+                continue
+            
+            # Stage 2: bucket by a hash of the first block
+            by_prefix: Dict[bytes, List[str]] = {}
+            for file_path in paths:
+                try:
+                    with open(file_path, 'rb') as f:
+                        prefix = hashlib.blake2b(f.read(DUPLICATE_PREFIX_SIZE), digest_size=16).digest()
+                    by_prefix.setdefault(prefix, []).append(file_path)
+                except OSError as e:
+                    logging.error(f"Error processing {file_path}: {e}")
             
-            if not recursive:
-                break
+            for candidates in by_prefix.values():
+                if len(candidates) < 2:
+                    continue
+                
+                # Stage 3: the prefix already covers small files entirely
+                if size <= DUPLICATE_PREFIX_SIZE:
+                    duplicates.extend((dup, candidates[0]) for dup in candidates[1:])
+                    continue
+                
+                full_hash_groups.append((size, candidates))
+        
+        # Stage 4: fully hash the survivors, in parallel when a processor is given
+        if processor is not None:
+            files = [(file_path, size) for size, candidates in full_hash_groups for file_path in candidates]
+            digests = processor.digest_files(files)
+        else:
+            digests = {
+                file_path: FileOperations.calculate_digest(file_path, "default")
+                for _, candidates in full_hash_groups for file_path in candidates
+            }
+        
+        for _, candidates in full_hash_groups:
+            hashes: Dict[bytes, str] = {}
+            for file_path in candidates:
+                file_hash = digests[file_path]
+                if file_hash is None:
+                    continue
+                if file_hash in hashes:
+                    duplicates.append((file_path, hashes[file_hash]))
+                else:
+                    hashes[file_hash] = file_path
+        
+        return duplicates
+    
+    @staticmethod
+    def compile_rename_pattern(pattern: str) -> Callable[[str], str]:
+        """Compile a rename pattern into a function mapping a file name to its new name"""
+        # Date and time are fixed for the whole batch
+        now = datetime.now()
+        fixed = {"{d}": now.strftime("%Y%m%d"), "{t}": now.strftime("%H%M%S")}
+        parts = [fixed.get(part, part) for part in RENAME_PLACEHOLDER_RE.split(pattern) if part]
+        
+        if "{n}" not in parts and "{r}" not in parts:
+            new_name = "".join(parts)
+            return lambda name: new_name
+        
+        random_letters = FileOperations.random_letters
+        has_random = "{r}" in parts
+        
+        def render(name: str) -> str:
+            # Every {r} in one name gets the same letters
+            letters = random_letters(4) if has_random else ""
+            return "".join(
+                name if part == "{n}" else letters if part == "{r}" else part
+                for part in parts
+            )
+        
+        return render
+    
+    @staticmethod
+    def find_rename_candidates(folder_path: str, extensions: Iterable[str], recursive: bool = False,
+                               dir_mtimes: Optional[Dict[str, int]] = None) -> List[Tuple[str, str, int]]:
+        """List (path, file name, extension offset) for files matching the extensions"""
+        extensions = FileOperations.normalize_extensions(extensions)
+        candidates = []
+        append = candidates.append
+        
+        for entry in FileOperations.iter_files(folder_path, recursive, dir_mtimes):
+            filename = entry.name
+            dot = filename.rfind('.')
+            if dot > 0 and filename[dot:].lower() in extensions:
+                append((entry.path, filename, dot))
+        
+        return candidates
+    
+    @staticmethod
+    def rename_files(candidates: Iterable[Tuple[str, str, int]], pattern: str) -> List[Tuple[str, str]]:
+        """Rename candidate files with specified pattern, returning the (old, new) paths renamed"""
+        renamed = []
+        append = renamed.append
+        render = FileOperations.compile_rename_pattern(pattern)
+        rename = os.rename
+        
+        for src, filename, dot in candidates:
+            try:
+                new_name = render(filename[:dot])
+                
+                # The path is the folder path plus the name; swap the name in place
+                dst = f"{src[:len(src) - len(filename)]}{new_name}{filename[dot:]}"
                 
+                if src != dst:
+                    rename(src, dst)
+                    append((src, dst))
+            except Exception as e:
+                logging.error(f"Error renaming {filename}: {e}")
+        
         return renamed
+    
+    @staticmethod
+    def batch_rename(folder_path: str, pattern: str, 
+                    extensions: Iterable[str], recursive: bool = False) -> int:
+        """Batch rename files with specified pattern"""
+        candidates = FileOperations.find_rename_candidates(folder_path, extensions, recursive)
+        return len(FileOperations.rename_files(candidates, pattern))
+
+class ChecksumCache:
+    """Persistent checksums keyed on path and algorithm, valid while mtime and size match"""
+    
+    def __init__(self, db_path: str = CHECKSUM_CACHE_FILE, timeout: float = CHECKSUM_CACHE_TIMEOUT):
+        self.conn = sqlite3.connect(db_path, timeout=timeout)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (path TEXT, algo TEXT, mtime INTEGER, size INTEGER, "
+            "digest TEXT, PRIMARY KEY (path, algo))"
+        )
+    
+    def get(self, path: str, algorithm: str, st: os.stat_result) -> Optional[str]:
+        """Return the stored checksum if the file is unchanged since it was hashed"""
+        row = self.conn.execute(
+            "SELECT digest, mtime, size FROM cache WHERE path = ? AND algo = ?", (path, algorithm)
+        ).fetchone()
+        if row is not None and row[1] == st.st_mtime_ns and row[2] == st.st_size:
+            return row[0]
+        return None
+    
+    def put(self, path: str, algorithm: str, st: os.stat_result, checksum: str):
+        """Store a checksum for the file as it was when stat'ed"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+            (path, algorithm, st.st_mtime_ns, st.st_size, checksum)
+        )
+    
+    def close(self):
+        """Commit pending writes and close the database"""
+        try:
+            self.conn.commit()
+        finally:
+            self.conn.close()
 
 class ModernUI(tk.Tk):
     """Modern Tkinter UI with improved styling and functionality"""
@@ -256,12 +673,26 @@ class ModernUI(tk.Tk):
         self.style.configure('TNotebook', background='#f0f0f0')
         self.style.configure('TNotebook.Tab', padding=[10, 5], font=self.button_font)
         
-        # Initialize file processor
-        self.processor = FileProcessor()
+        # Initialize file processor; its progress events and worker UI updates are applied by _drain_ui_q
+        self._ui_q = queue.SimpleQueue()
+        self.progress = Counter()
+        self.processor = FileProcessor(ui_queue=self._ui_q)
+        self._progress_after: Optional[str] = None
+        self._workers = 0  # Background threads that may still post UI updates
         
         # Load config
         self.config = self.load_config()
         
+        # Byte offset of the log file already shown in the log viewer
+        self._log_pos = 0
+        # Last error shown per log view, so polling doesn't repeat it
+        self._log_errors: Dict[tk.Text, str] = {}
+        
+        # Log file window, kept alive between opens with its own offset
+        self._log_window: Optional[tk.Toplevel] = None
+        self._log_window_text: Optional[tk.Text] = None
+        self._log_window_pos = 0
+        
         # Build UI
         self.create_widgets()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -270,8 +701,8 @@ class ModernUI(tk.Tk):
         """Load configuration from file"""
         try:
             if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r') as f:
-                    return json.load(f)
+                with open(CONFIG_FILE, 'rb') as f:
+                    return _json_loads(f.read())
         except Exception as e:
             logging.error(f"Error loading config: {e}")
         return {
@@ -283,14 +714,14 @@ class ModernUI(tk.Tk):
     def save_config(self):
         """Save configuration to file"""
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            with open(CONFIG_FILE, 'wb') as f:
+                f.write(_json_dumps(self.config))
         except Exception as e:
             logging.error(f"Error saving config: {e}")
     
     def on_close(self):
         """Handle window close event"""
-        self.processor.stop_workers()
+        self.processor.shutdown()
         self.save_config()
         self.destroy()
     
@@ -320,9 +751,6 @@ class ModernUI(tk.Tk):
         
         self.status_label = ttk.Label(self.status_frame, text="Ready")
         self.status_label.pack(side=tk.LEFT)
-        
-        # Start progress updater
-        self.update_progress()
     
     def create_text_tab(self):
         """Create the text processing tab"""
@@ -431,13 +859,14 @@ class ModernUI(tk.Tk):
         rename_frame.pack(fill=tk.X, pady=5)
         
         ttk.Label(rename_frame, text="Folder:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.rename_folder_entry = ttk.Entry(rename_frame)
+        self.rename_folder_var = tk.StringVar()
+        self.rename_folder_entry = ttk.Entry(rename_frame, textvariable=self.rename_folder_var)
         self.rename_folder_entry.grid(row=0, column=1, sticky=tk.EW, pady=2)
         ttk.Button(rename_frame, text="Browse", command=lambda: self.browse_folder(self.rename_folder_entry)).grid(row=0, column=2, padx=5)
         
         ttk.Label(rename_frame, text="Pattern:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.rename_pattern_entry = ttk.Entry(rename_frame)
-        self.rename_pattern_entry.insert(0, "{n}_{d}_{r}")
+        self.rename_pattern_var = tk.StringVar(value="{n}_{d}_{r}")
+        self.rename_pattern_entry = ttk.Entry(rename_frame, textvariable=self.rename_pattern_var)
         self.rename_pattern_entry.grid(row=1, column=1, sticky=tk.EW, pady=2)
         
         ttk.Label(rename_frame, text="Available placeholders:").grid(row=2, column=0, sticky=tk.W, pady=2)
@@ -445,21 +874,34 @@ class ModernUI(tk.Tk):
         placeholders.grid(row=2, column=1, sticky=tk.W, pady=2)
         
         ttk.Label(rename_frame, text="Extensions:").grid(row=3, column=0, sticky=tk.W, pady=2)
-        self.rename_ext_entry = ttk.Entry(rename_frame)
-        self.rename_ext_entry.insert(0, ",".join(DEFAULT_EXTENSIONS))
+        self.rename_ext_var = tk.StringVar(value=",".join(DEFAULT_EXTENSIONS))
+        self.rename_ext_entry = ttk.Entry(rename_frame, textvariable=self.rename_ext_var)
         self.rename_ext_entry.grid(row=3, column=1, sticky=tk.EW, pady=2)
         
+        # Parsed extensions are cached until the field is edited
+        self._rename_exts: Optional[FrozenSet[str]] = None
+        self.rename_ext_var.trace_add("write", self._invalidate_rename_extensions)
+        
+        # Last folder listing as (folder, extensions, recursive), directory mtimes, candidates
+        self._rename_listing: Optional[Tuple[Tuple[str, FrozenSet[str], bool], Dict[str, int], List[Tuple[str, str, int]]]] = None
+        
+        # Typing in any rename field refreshes the preview once the burst of keystrokes ends
+        self._preview_after = None
+        for entry in (self.rename_folder_entry, self.rename_pattern_entry, self.rename_ext_entry):
+            entry.bind("<KeyRelease>", self._schedule_preview)
+        
         self.rename_recursive_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(rename_frame, text="Include subfolders", variable=self.rename_recursive_var).grid(row=4, column=1, sticky=tk.W)
         
         ttk.Button(rename_frame, text="Preview Rename", command=self.preview_rename).grid(row=5, column=1, pady=5, sticky=tk.W)
-        ttk.Button(rename_frame, text="Execute Rename", command=self.execute_rename).grid(row=5, column=2, pady=5, sticky=tk.W)
+        self.rename_button = ttk.Button(rename_frame, text="Execute Rename", command=self.execute_rename)
+        self.rename_button.grid(row=5, column=2, pady=5, sticky=tk.W)
         
         # Preview area
         preview_frame = ttk.LabelFrame(tab, text="Preview", padding=10)
         preview_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        self.preview_text = scrolledtext.ScrolledText(preview_frame, height=10)
+        self.preview_text = scrolledtext.ScrolledText(preview_frame, height=10, state=tk.DISABLED)
         self.preview_text.pack(fill=tk.BOTH, expand=True)
         
         # Configure grid weights
@@ -475,23 +917,36 @@ class ModernUI(tk.Tk):
         checksum_frame.pack(fill=tk.X, pady=5)
         
         ttk.Label(checksum_frame, text="Folder:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.checksum_folder_entry = ttk.Entry(checksum_frame)
+        self.checksum_folder_var = tk.StringVar()
+        self.checksum_folder_entry = ttk.Entry(checksum_frame, textvariable=self.checksum_folder_var)
         self.checksum_folder_entry.grid(row=0, column=1, sticky=tk.EW, pady=2)
         ttk.Button(checksum_frame, text="Browse", command=lambda: self.browse_folder(self.checksum_folder_entry)).grid(row=0, column=2, padx=5)
         
         ttk.Label(checksum_frame, text="Algorithm:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.checksum_algo_var = tk.StringVar(value="md5")
+        self.checksum_algo_var = tk.StringVar(value="blake2b")
         ttk.Combobox(checksum_frame, textvariable=self.checksum_algo_var, 
-                     values=["md5", "sha1", "sha256", "sha512"]).grid(row=1, column=1, sticky=tk.W, pady=2)
+                     values=CHECKSUM_ALGORITHMS).grid(row=1, column=1, sticky=tk.W, pady=2)
+        
+        ttk.Label(checksum_frame, text="Extensions (blank for all):").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.checksum_ext_entry = ttk.Entry(checksum_frame)
+        self.checksum_ext_entry.grid(row=2, column=1, sticky=tk.EW, pady=2)
         
-        ttk.Button(checksum_frame, text="Calculate Checksums", command=self.calculate_checksums).grid(row=2, column=1, pady=5, sticky=tk.W)
+        ttk.Label(checksum_frame, text="Max file size (MB, blank for no limit):").grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.checksum_maxsize_var = tk.StringVar()
+        ttk.Entry(checksum_frame, textvariable=self.checksum_maxsize_var).grid(row=3, column=1, sticky=tk.W, pady=2)
         
-        # Results area
-        results_frame = ttk.LabelFrame(tab, text="Results", padding=10)
-        results_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.checksum_button = ttk.Button(checksum_frame, text="Calculate Checksums", command=self.calculate_checksums)
+        self.checksum_button.grid(row=4, column=1, pady=5, sticky=tk.W)
         
-        self.checksum_text = scrolledtext.ScrolledText(results_frame, height=10)
-        self.checksum_text.pack(fill=tk.BOTH, expand=True)
+        # Results area, with errors kept apart from the digests
+        results_notebook = ttk.Notebook(tab)
+        results_notebook.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        self.checksum_text = scrolledtext.ScrolledText(results_notebook, height=10, state=tk.DISABLED)
+        results_notebook.add(self.checksum_text, text="Results")
+        
+        self.checksum_errors_text = scrolledtext.ScrolledText(results_notebook, height=10, state=tk.DISABLED)
+        results_notebook.add(self.checksum_errors_text, text="Errors")
         
         # Configure grid weights
         checksum_frame.columnconfigure(1, weight=1)
@@ -513,11 +968,12 @@ class ModernUI(tk.Tk):
         log_frame = ttk.LabelFrame(tab, text="Application Logs", padding=10)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=20)
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=20, state=tk.DISABLED)
         self.log_text.pack(fill=tk.BOTH, expand=True)
         
-        # Load initial logs
+        # Load initial logs and keep tailing the file
         self.refresh_logs()
+        self.after(LOG_POLL_MS, self._poll_logs)
     
     def browse_folder(self, entry_widget=None):
         """Browse for folder and update the specified entry widget"""
@@ -540,7 +996,7 @@ class ModernUI(tk.Tk):
         folder = self.folder_entry.get()
         text = self.text_entry.get()
         position = self.position_var.get()
-        extensions = [ext.strip() for ext in self.extensions_entry.get().split(",")]
+        extensions = FileOperations.normalize_extensions(self.extensions_entry.get().split(","))
         max_size = int(self.max_size_entry.get()) * 1024 * 1024  # Convert MB to bytes
         recursive = self.subfolders_var.get()
         create_backup = self.backup_var.get()
@@ -549,26 +1005,29 @@ class ModernUI(tk.Tk):
             messagebox.showwarning("Input Error", "Please specify folder and text")
             return
         
-        # Start worker threads
-        self.processor.start_workers()
-        self.processor.reset_progress()
+        self.reset_progress()
+        queued = 0
         
-        # Walk through folder and add tasks
-        for root, dirs, files in os.walk(folder):
-            for filename in files:
-                file_ext = os.path.splitext(filename)[1].lower()
-                if file_ext in extensions:
-                    file_path = os.path.join(root, filename)
-                    if os.path.getsize(file_path) <= max_size:
-                        self.processor.add_task(
-                            FileOperations.add_text_to_file,
-                            file_path, text, position, create_backup
-                        )
-            
-            if not recursive:
-                break
+        # Bind loop-invariant lookups to locals
+        add_task = self.processor.add_task
+        add_text_to_file = FileOperations.add_text_to_file
         
-        messagebox.showinfo("Processing", f"Added {self.processor.progress['total']} files to queue")
+        # Walk through folder and add tasks
+        for entry in FileOperations.iter_files(folder, recursive):
+            filename = entry.name
+            dot = filename.rfind('.')
+            if dot > 0 and filename[dot:].lower() in extensions:
+                try:
+                    size = entry.stat().st_size
+                except OSError as e:
+                    logging.error(f"Error processing {entry.path}: {e}")
+                    continue
+                if size <= max_size:
+                    add_task(add_text_to_file, entry.path, text, position, create_backup)
+                    queued += 1
+        
+        self._arm_progress()
+        messagebox.showinfo("Processing", f"Added {queued} files to queue")
     
     def restore_backups(self):
         """Restore files from backups"""
@@ -577,21 +1036,21 @@ class ModernUI(tk.Tk):
             messagebox.showwarning("Input Error", "Please specify folder")
             return
         
-        # Start worker threads
-        self.processor.start_workers()
-        self.processor.reset_progress()
+        self.reset_progress()
+        queued = 0
+        
+        # Bind loop-invariant lookups to locals
+        add_task = self.processor.add_task
+        restore_backup = FileOperations.restore_backup
         
         # Walk through folder and restore backups
-        for root, _, files in os.walk(folder):
-            for filename in files:
-                if filename.endswith(BACKUP_EXTENSION):
-                    backup_path = os.path.join(root, filename)
-                    self.processor.add_task(
-                        FileOperations.restore_backup,
-                        backup_path
-                    )
+        for entry in FileOperations.iter_files(folder):
+            if entry.name.endswith(BACKUP_EXTENSION):
+                add_task(restore_backup, entry.path)
+                queued += 1
         
-        messagebox.showinfo("Processing", f"Found {self.processor.progress['total']} backups to restore")
+        self._arm_progress()
+        messagebox.showinfo("Processing", f"Found {queued} backups to restore")
     
     def create_dummy_files(self):
         """Create dummy files"""
@@ -604,9 +1063,7 @@ class ModernUI(tk.Tk):
             messagebox.showwarning("Input Error", "Please specify folder")
             return
         
-        # Start worker threads
-        self.processor.start_workers()
-        self.processor.reset_progress()
+        self.reset_progress()
         
         # Add tasks for dummy files
         for _ in range(num_files):
@@ -615,6 +1072,7 @@ class ModernUI(tk.Tk):
                 folder, extension, name_type
             )
         
+        self._arm_progress()
         messagebox.showinfo("Processing", f"Creating {num_files} dummy files")
     
     def delete_empty_files(self):
@@ -624,17 +1082,7 @@ class ModernUI(tk.Tk):
             messagebox.showwarning("Input Error", "Please specify folder")
             return
         
-        deleted = 0
-        for root, _, files in os.walk(folder):
-            for filename in files:
-                file_path = os.path.join(root, filename)
-                if os.path.getsize(file_path) == 0:
-                    try:
-                        os.remove(file_path)
-                        deleted += 1
-                    except Exception as e:
-                        logging.error(f"Error deleting {file_path}: {e}")
-        
+        deleted = FileOperations.delete_empty_files(folder)
         messagebox.showinfo("Complete", f"Deleted {deleted} empty files")
     
     def find_duplicates(self):
@@ -644,20 +1092,7 @@ class ModernUI(tk.Tk):
             messagebox.showwarning("Input Error", "Please specify folder")
             return
         
-        hashes = {}
-        duplicates = []
-        
-        for root, _, files in os.walk(folder):
-            for filename in files:
-                file_path = os.path.join(root, filename)
-                try:
-                    file_hash = FileOperations.calculate_checksum(file_path)
-                    if file_hash in hashes:
-                        duplicates.append((file_path, hashes[file_hash]))
-                    else:
-                        hashes[file_hash] = file_path
-                except Exception as e:
-                    logging.error(f"Error processing {file_path}: {e}")
+        duplicates = FileOperations.find_duplicates(folder, self.processor)
         
         if duplicates:
             result = "Duplicate files found:\n\n"
@@ -669,108 +1104,363 @@ class ModernUI(tk.Tk):
         else:
             messagebox.showinfo("No Duplicates", "No duplicate files found")
     
-    def preview_rename(self):
+    def _invalidate_rename_extensions(self, *_):
+        """Drop the parsed rename extensions after the field changes"""
+        self._rename_exts = None
+    
+    def get_rename_extensions(self) -> FrozenSet[str]:
+        """Get the rename extensions, parsing the field only after it changed"""
+        if self._rename_exts is None:
+            self._rename_exts = FileOperations.normalize_extensions(self.rename_ext_var.get().split(","))
+        return self._rename_exts
+    
+    def _cached_rename_candidates(self, key: Tuple[str, FrozenSet[str], bool]) -> Optional[List[Tuple[str, str, int]]]:
+        """Return the last listing if it matches the key and no directory in it changed"""
+        if self._rename_listing is not None and self._rename_listing[0] == key:
+            _, dir_mtimes, candidates = self._rename_listing
+            try:
+                if all(os.stat(path).st_mtime_ns == mtime for path, mtime in dir_mtimes.items()):
+                    return candidates
+            except OSError:
+                pass
+        return None
+    
+    def get_rename_candidates(self, folder: str, recursive: bool) -> List[Tuple[str, str, int]]:
+        """Get the files to rename, reusing the last listing while no directory in it changed"""
+        key = (folder, self.get_rename_extensions(), recursive)
+        candidates = self._cached_rename_candidates(key)
+        if candidates is not None:
+            return candidates
+        
+        dir_mtimes = {}
+        candidates = FileOperations.find_rename_candidates(folder, key[1], recursive, dir_mtimes)
+        self._rename_listing = (key, dir_mtimes, candidates)
+        return candidates
+    
+    def _schedule_preview(self, *_):
+        """Restart the preview timer so only the last of several quick edits walks the folder"""
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+        self._preview_after = self.after(PREVIEW_DEBOUNCE_MS, self._auto_preview)
+    
+    def _auto_preview(self):
+        """Refresh the preview after typing, unless a rename is running or subfolders are included"""
+        self._preview_after = None
+        # A half-typed folder like "/" would walk the whole tree on the Tk thread
+        if self.rename_recursive_var.get() or self.rename_button.instate(['disabled']):
+            return
+        self.preview_rename(quiet=True)
+    
+    def preview_rename(self, quiet: bool = False):
         """Preview batch rename operation"""
-        folder = self.rename_folder_entry.get()
-        pattern = self.rename_pattern_entry.get()
-        extensions = [ext.strip() for ext in self.rename_ext_entry.get().split(",")]
+        folder = self.rename_folder_var.get()
+        pattern = self.rename_pattern_var.get()
         recursive = self.rename_recursive_var.get()
         
-        if not folder or not pattern:
+        if quiet:
+            # Half-typed input is expected while editing; just wait for more
+            if not pattern or not os.path.isdir(folder):
+                return
+        elif not folder or not pattern:
             messagebox.showwarning("Input Error", "Please specify folder and pattern")
             return
         
         preview = []
+        append = preview.append
+        render = FileOperations.compile_rename_pattern(pattern)
         
-        for root, _, files in os.walk(folder):
-            for filename in files:
-                file_ext = os.path.splitext(filename)[1].lower()
-                if file_ext in extensions:
-                    old_path = os.path.join(root, filename)
-                    name, ext = os.path.splitext(filename)
-                    
-                    new_name = pattern
-                    new_name = new_name.replace("{n}", name)
-                    new_name = new_name.replace("{d}", datetime.now().strftime("%Y%m%d"))
-                    new_name = new_name.replace("{t}", datetime.now().strftime("%H%M%S"))
-                    new_name = new_name.replace("{r}", ''.join(random.choices(string.ascii_letters, k=4)))
-                    
-                    new_path = os.path.join(root, f"{new_name}{ext}")
-                    
-                    preview.append(f"{old_path} -> {new_path}")
+        for old_path, filename, dot in self.get_rename_candidates(folder, recursive):
+            new_name = render(filename[:dot])
+            
+            new_path = f"{old_path[:len(old_path) - len(filename)]}{new_name}{filename[dot:]}"
             
-            if not recursive:
-                break
+            append(f"{old_path} -> {new_path}")
         
-        self.preview_text.delete(1.0, tk.END)
-        self.preview_text.insert(tk.END, "\n".join(preview) if preview else "No files to rename")
+        self.set_text(self.preview_text, "\n".join(preview) if preview else "No files to rename")
     
     def execute_rename(self):
         """Execute batch rename operation"""
-        folder = self.rename_folder_entry.get()
-        pattern = self.rename_pattern_entry.get()
-        extensions = [ext.strip() for ext in self.rename_ext_entry.get().split(",")]
+        folder = self.rename_folder_var.get()
+        pattern = self.rename_pattern_var.get()
         recursive = self.rename_recursive_var.get()
         
         if not folder or not pattern:
             messagebox.showwarning("Input Error", "Please specify folder and pattern")
             return
         
-        renamed = FileOperations.batch_rename(folder, pattern, extensions, recursive)
-        messagebox.showinfo("Complete", f"Renamed {renamed} files")
-        self.preview_rename()  # Refresh preview
+        # The cached listing is only trusted for previews; coarse directory mtimes could
+        # hide a new file, so the worker always lists the folder again before renaming
+        extensions = self.get_rename_extensions()
+        self._rename_listing = None
+        
+        self.rename_button.state(['disabled'])
+        self._start_worker(self._rename_worker, folder, pattern, extensions, recursive)
+    
+    def _rename_worker(self, folder: str, pattern: str, extensions: FrozenSet[str], recursive: bool):
+        """Rename files off the UI thread and hand the results back to it"""
+        try:
+            candidates = FileOperations.find_rename_candidates(folder, extensions, recursive)
+            pairs = FileOperations.rename_files(candidates, pattern)
+            self._post(self._finish_rename, pairs)
+        except Exception as e:
+            logging.error(f"Batch rename failed: {e}")
+            self._post(messagebox.showerror, "Error", f"Rename failed: {e}")
+        finally:
+            # Re-enable the button even if the batch failed
+            self._post(self.rename_button.state, ['!disabled'])
+    
+    def _finish_rename(self, pairs: List[Tuple[str, str]]):
+        """Show the completed renames without walking the folder again"""
+        self.set_text(self.preview_text, "\n".join(f"{old} -> {new}" for old, new in pairs) if pairs else "No files renamed")
+        messagebox.showinfo("Complete", f"Renamed {len(pairs)} files")
     
     def calculate_checksums(self):
         """Calculate checksums for files in folder"""
-        folder = self.checksum_folder_entry.get()
+        folder = self.checksum_folder_var.get()
         algorithm = self.checksum_algo_var.get()
+        extensions = FileOperations.normalize_extensions(self.checksum_ext_entry.get().split(","))
+        max_size_text = self.checksum_maxsize_var.get().strip()
         
         if not folder:
             messagebox.showwarning("Input Error", "Please specify folder")
             return
         
-        results = []
+        try:
+            max_size = int(max_size_text) * 1024 * 1024 if max_size_text else None  # Convert MB to bytes
+        except ValueError:
+            messagebox.showwarning("Input Error", "Max file size must be a whole number of MB")
+            return
         
-        for root, _, files in os.walk(folder):
-            for filename in files:
-                file_path = os.path.join(root, filename)
+        self.set_text(self.checksum_text, "")
+        self.set_text(self.checksum_errors_text, "")
+        # One run at a time, so results and the cache aren't shared between workers
+        self.checksum_button.state(['disabled'])
+        self._start_worker(self._run_checksum_worker, folder, algorithm, extensions, max_size)
+    
+    def _run_checksum_worker(self, *args):
+        """Run the checksum worker and re-enable the button after its last update"""
+        try:
+            self._checksum_worker(*args)
+        finally:
+            self._post(self.checksum_button.state, ['!disabled'])
+    
+    def _checksum_worker(self, folder: str, algorithm: str,
+                         extensions: FrozenSet[str], max_size: Optional[int]):
+        """Hash files in parallel off the Tk thread and hand the results back to it"""
+        # Result lines are written straight into one reusable buffer
+        batch = io.StringIO()
+        write = batch.write
+        batch_lines = 0
+        errors = deque(maxlen=CHECKSUM_MAX_ERRORS)
+        error_count = 0
+        last_flush = time.monotonic()
+        processed = 0
+        
+        def flush():
+            nonlocal batch_lines
+            if batch_lines:
+                chunk = batch.getvalue()
+                batch.seek(0)
+                batch.truncate()
+                batch_lines = 0
+                self._post(self.append_text, self.checksum_text, chunk)
+        
+        def add_result(filename: str, checksum: str):
+            nonlocal batch_lines, last_flush
+            write(filename)
+            write(": ")
+            write(checksum)
+            write("\n")
+            batch_lines += 1
+            if batch_lines >= CHECKSUM_BATCH_LINES or time.monotonic() - last_flush >= CHECKSUM_BATCH_SECONDS:
+                flush()
+                last_flush = time.monotonic()
+        
+        # Unchanged files are answered from the cache instead of being hashed again
+        try:
+            store = ChecksumCache()
+        except sqlite3.Error as e:
+            logging.error(f"Checksum cache unavailable: {e}")
+            store = None
+        cache = store
+        
+        def cache_failed(e: sqlite3.Error):
+            # A locked or broken cache only costs speed; hash the rest of the run without it
+            nonlocal cache
+            logging.error(f"Checksum cache disabled for this run: {e}")
+            cache = None
+        
+        def collect(future: Future):
+            nonlocal processed, error_count
+            entry, st = futures.pop(future)
+            processed += 1
+            try:
+                checksum = future.result().hex()
+            except Exception as e:
+                logging.error(f"Error calculating checksum for {entry.path}: {e}")
+                errors.append(f"{entry.path}: {e!r}")
+                error_count += 1
+                return
+            
+            add_result(entry.name, checksum)
+            if cache is not None:
                 try:
-                    checksum = FileOperations.calculate_checksum(file_path, algorithm)
-                    results.append(f"{filename}: {checksum}")
-                except Exception as e:
-                    results.append(f"{filename}: ERROR - {str(e)}")
+                    cache.put(entry.path, algorithm, st, checksum)
+                except sqlite3.Error as e:
+                    cache_failed(e)
+        
+        def drain(limit: int):
+            # Collect hashes until at most limit are in flight, flushing lines that finished
+            # earlier while a large file holds up the rest
+            nonlocal last_flush
+            while len(futures) > limit:
+                done, _ = wait(futures, timeout=CHECKSUM_BATCH_SECONDS, return_when=FIRST_COMPLETED)
+                if not done:
+                    flush()
+                    last_flush = time.monotonic()
+                for future in done:
+                    collect(future)
+        
+        workers = os.cpu_count() or 1
+        # Keep only a couple of files queued per worker so prefetched data is still cached when hashed
+        max_in_flight = 2 * workers
+        prefetch = FileOperations.prefetch
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            # Absolute entry paths make the cache keys independent of the working directory
+            for entry in FileOperations.iter_files(os.path.abspath(folder)):
+                # Skip unwanted files before any of their bytes are read
+                filename = entry.name
+                if extensions:
+                    dot = filename.rfind('.')
+                    if dot <= 0 or filename[dot:].lower() not in extensions:
+                        continue
+                try:
+                    st = entry.stat()
+                except OSError as e:
+                    errors.append(f"{entry.path}: {e!r}")
+                    error_count += 1
+                    continue
+                if max_size is not None and st.st_size > max_size:
+                    continue
+                
+                if cache is not None:
+                    try:
+                        checksum = cache.get(entry.path, algorithm, st)
+                    except sqlite3.Error as e:
+                        cache_failed(e)
+                        checksum = None
+                    if checksum is not None:
+                        add_result(filename, checksum)
+                        processed += 1
+                        continue
+                
+                if len(futures) >= max_in_flight:
+                    drain(max_in_flight - 1)
+                
+                # Start reading the file while the workers are still busy with earlier ones
+                prefetch(entry.path)
+                futures[executor.submit(FileOperations.hash_file, entry.path, algorithm)] = (entry, st)
+            drain(0)
         
-        self.checksum_text.delete(1.0, tk.END)
-        self.checksum_text.insert(tk.END, "\n".join(results) if results else "No files processed")
+        if store is not None:
+            try:
+                store.close()
+            except sqlite3.Error as e:
+                logging.error(f"Could not save checksum cache: {e}")
+        
+        if error_count:
+            shown = f" (showing last {len(errors)})" if error_count > len(errors) else ""
+            write(f"{error_count} errors{shown}. See Errors tab.\n")
+            batch_lines += 1
+            self._post(self.set_text, self.checksum_errors_text, "\n".join(errors))
+        flush()
+        if not processed and not error_count:
+            self._post(self.set_text, self.checksum_text, "No files processed")
     
-    def refresh_logs(self):
-        """Refresh log display"""
+    def _tail_log(self, widget: tk.Text, pos: int) -> int:
+        """Append log file content past pos to a text widget, returning the new offset"""
         try:
-            with open('cons0leweb_utils.log', 'r') as f:
-                logs = f.read()
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.insert(tk.END, logs)
-            self.log_text.see(tk.END)
+            size = os.path.getsize(LOG_FILE)
+            self._log_errors.pop(widget, None)
+            if size == pos:
+                return pos
+            if size < pos:
+                # The log was truncated, start over
+                pos = 0
+                self.set_text(widget, "")
+            
+            with open(LOG_FILE, 'rb') as f:
+                f.seek(pos)
+                data = f.read()
+            
+            # Only consume complete lines so a record is never split mid-write
+            data = data[:data.rfind(b"\n") + 1]
+            if data:
+                pos += len(data)
+                self.append_text(widget, data.decode('utf-8', 'replace'))
         except Exception as e:
-            self.log_text.insert(tk.END, f"Error loading logs: {str(e)}")
+            message = f"Error loading logs: {str(e)}\n"
+            if self._log_errors.get(widget) != message:
+                self._log_errors[widget] = message
+                self.append_text(widget, message)
+        return pos
+    
+    def refresh_logs(self):
+        """Append new log file content to the log display"""
+        self._log_pos = self._tail_log(self.log_text, self._log_pos)
+        if self._log_window is not None and self._log_window.state() != "withdrawn":
+            self._log_window_pos = self._tail_log(self._log_window_text, self._log_window_pos)
+    
+    def _poll_logs(self):
+        """Periodically tail the log file into the log display"""
+        self.refresh_logs()
+        self.after(LOG_POLL_MS, self._poll_logs)
     
     def clear_logs(self):
         """Clear log file"""
         try:
-            with open('cons0leweb_utils.log', 'w'):
+            with open(LOG_FILE, 'w'):
                 pass
+            self._log_pos = 0
+            self.set_text(self.log_text, "")
+            if self._log_window is not None:
+                self._log_window_pos = 0
+                self.set_text(self._log_window_text, "")
             self.refresh_logs()
         except Exception as e:
             messagebox.showerror("Error", f"Could not clear logs: {str(e)}")
     
     def open_log_file(self):
-        """Open log file in default editor"""
+        """Show the log file in a separate window, reusing it after the first open"""
         try:
-            webbrowser.open('cons0leweb_utils.log')
+            if self._log_window is None:
+                self._log_window, self._log_window_text = self.show_scrollable_message(
+                    f"Log File - {LOG_FILE}", "", hide_on_close=True
+                )
+            else:
+                self._log_window.deiconify()
+                self._log_window.lift()
+            self.refresh_logs()
         except Exception as e:
             messagebox.showerror("Error", f"Could not open log file: {str(e)}")
     
-    def show_scrollable_message(self, title, message):
+    def set_text(self, widget: tk.Text, content: str):
+        """Replace the content of a read-only text widget with one insert"""
+        widget.config(state=tk.NORMAL)
+        widget.delete(1.0, tk.END)
+        widget.insert(tk.END, content)
+        widget.config(state=tk.DISABLED)
+    
+    def append_text(self, widget: tk.Text, content: str):
+        """Append to a read-only text widget with one insert and scroll to the end"""
+        widget.config(state=tk.NORMAL)
+        widget.insert(tk.END, content)
+        widget.config(state=tk.DISABLED)
+        widget.see(tk.END)
+    
+    def show_scrollable_message(self, title, message, hide_on_close: bool = False) -> Tuple[tk.Toplevel, tk.Text]:
         """Show a message in a scrollable dialog"""
         dialog = tk.Toplevel(self)
         dialog.title(title)
@@ -780,11 +1470,72 @@ class ModernUI(tk.Tk):
         text.insert(tk.END, message)
         text.config(state=tk.DISABLED)
         
-        ttk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=5)
+        # Hidden dialogs keep their content so they can be shown again instantly
+        close = dialog.withdraw if hide_on_close else dialog.destroy
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        ttk.Button(dialog, text="Close", command=close).pack(pady=5)
+        return dialog, text
+    
+    def _post(self, func: Callable, *args):
+        """Queue a UI call from a worker thread; only the Tk thread runs it, in _drain_ui_q"""
+        self._ui_q.put(("call", (func, args)))
+    
+    def _start_worker(self, target: Callable, *args):
+        """Run target on a daemon thread, polling for its posted UI updates until it ends"""
+        self._workers += 1
+        self._arm_progress()
+        threading.Thread(target=self._run_worker, args=(target,) + args, daemon=True).start()
+    
+    def _run_worker(self, target: Callable, *args):
+        """Thread body for _start_worker"""
+        try:
+            target(*args)
+        finally:
+            self._post(self._worker_finished)
+    
+    def _worker_finished(self):
+        """Stop counting a background thread once its last update has been applied"""
+        self._workers -= 1
+    
+    def _read_ui_q(self):
+        """Fold pending worker progress events into the progress counters and run posted UI calls"""
+        try:
+            while True:
+                key, value = self._ui_q.get_nowait()
+                if key == "call":
+                    func, args = value
+                    try:
+                        func(*args)
+                    except Exception as e:
+                        logging.error(f"Error applying background update: {e}")
+                else:
+                    self.progress[key] += value
+        except queue.Empty:
+            pass
+    
+    def _arm_progress(self):
+        """Start polling worker progress unless a poll is already scheduled"""
+        if self._progress_after is None:
+            self._progress_after = self.after(PROGRESS_POLL_MS, self._drain_ui_q)
+    
+    def _drain_ui_q(self):
+        """Apply worker events to the UI, polling until the batch and background threads finish"""
+        self._progress_after = None
+        self._read_ui_q()
+        self.update_progress()
+        
+        progress = self.progress
+        if self._workers or progress["processed"] + progress["errors"] < progress["total"]:
+            self._arm_progress()
+    
+    def reset_progress(self):
+        """Reset progress counters before starting a new batch"""
+        self._read_ui_q()
+        self.progress.clear()
     
     def update_progress(self):
         """Update progress bar and status"""
-        progress = self.processor.get_progress()
+        progress = self.progress
         
         if progress["total"] > 0:
             percent = (progress["processed"] / progress["total"]) * 100
@@ -795,8 +1546,6 @@ class ModernUI(tk.Tk):
         else:
             self.progress_bar["value"] = 0
             self.status_label.config(text="Ready")
-        
-        self.after(500, self.update_progress)
 
 if __name__ == "__main__":
     app = ModernUI()